@@ -1,10 +1,36 @@
 import re
 import requests
 import pandas as pd
+import orjson
 from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "https://clinicaltrials.gov/api/v2/studies"
 
+# v2 API field pieces for the columns we build (plus their fallbacks); everything else is left out of the response.
+API_FIELDS = ["NCTId", "BriefTitle", "OfficialTitle", "StartDate", "LocationCountry"]
+
+_YEAR_RE = re.compile(r"(\d{4})")
+
+def _build_session() -> requests.Session:
+    """Create a pooled session so repeated queries reuse the TCP/TLS connection."""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Accept": "application/json",
+        "User-Agent": "clinical-trials-dashboard/1.0 (+https://clinicaltrials.gov/api/v2)",
+    })
+    return session
+
+_SESSION = _build_session()
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session used for ClinicalTrials.gov requests."""
+    return _SESSION
+
 def _extract_year(value: Optional[str]) -> Optional[int]:
     """Return first 4-digit year found in value (or None)."""
     if value is None:
@@ -13,7 +39,10 @@ def _extract_year(value: Optional[str]) -> Optional[int]:
     if isinstance(value, (list, tuple)) and value:
         value = value[0]
     s = str(value)
-    m = re.search(r"(\d{4})", s)
+    # ISO-style dates ("2023-05-12", "2023-05") start with the year; skip the regex for them.
+    if len(s) >= 4 and s[:4].isdecimal():
+        return int(s[:4])
+    m = _YEAR_RE.search(s)
     return int(m.group(1)) if m else None
 
 def get_clinical_trials(disease: str, page_size: int = 100, params_override: dict = None) -> pd.DataFrame:
@@ -23,41 +52,51 @@ def get_clinical_trials(disease: str, page_size: int = 100, params_override: dic
     """
     params = {
         "query.cond": disease,
-        "pageSize": page_size
+        "pageSize": page_size,
+        "fields": ",".join(API_FIELDS),
     }
     if params_override:
-        params.update(params_override)
+        override = dict(params_override)
+        # Extra fields extend the default projection rather than replacing it.
+        extra = override.pop("fields", None)
+        params.update(override)
+        if extra:
+            if isinstance(extra, str):
+                extra = extra.split(",")
+            fields = API_FIELDS + [f.strip() for f in extra if f.strip() and f.strip() not in API_FIELDS]
+            params["fields"] = ",".join(fields)
 
-    resp = requests.get(BASE_URL, params=params, timeout=30)
+    resp = _SESSION.get(BASE_URL, params=params, timeout=30)
     resp.raise_for_status()
-    payload = resp.json()
-
-    records = []
-    for s in payload.get("studies", []):
-        ident = s.get("protocolSection", {}).get("identificationModule", {})
-        design = s.get("protocolSection", {}).get("designModule", {})
-
-        nct_id = ident.get("nctId") or ident.get("id")
-        brief_title = ident.get("briefTitle") or ident.get("officialTitle")
-
-        # country: first location (if present)
-        locs = s.get("protocolSection", {}).get("contactsLocationsModule", {}).get("locations") or []
-        country = None
-        if locs and isinstance(locs, (list, tuple)) and isinstance(locs[0], dict):
-            country = locs[0].get("country")
-
-        # start date -> year (defensive)
-        start_date = s.get("protocolSection", {}).get("statusModule", {}).get("startDateStruct", {}).get("date")
-        start_year = _extract_year(start_date)
-
-        records.append({
-            "nctId": nct_id,
-            "briefTitle": brief_title,
-            "startYear": start_year,
-            "country": country,
-        })
-
-    df = pd.DataFrame(records, columns=["nctId", "briefTitle", "startYear", "country"])
+    payload = orjson.loads(resp.content)
+
+    # Only protocolSection is read; flattening it alone skips the (large) results/derived sections.
+    protocols = [s.get("protocolSection") or {} for s in payload.get("studies", [])]
+    flat = pd.json_normalize(protocols)
+
+    def _col(name: str) -> pd.Series:
+        if name in flat.columns:
+            return flat[name].astype(object)
+        return pd.Series(None, index=flat.index, dtype=object)
+
+    ident = "identificationModule"
+    nct_id = _col(f"{ident}.nctId").fillna(_col(f"{ident}.id"))
+    brief_title = _col(f"{ident}.briefTitle").fillna(_col(f"{ident}.officialTitle"))
+
+    # country: first location (if present)
+    locs = _col("contactsLocationsModule.locations")
+    country = locs.str[0].astype(object).str.get("country")
+
+    # start date -> year (defensive); studies share few distinct dates, so parse each once
+    start_date = _col("statusModule.startDateStruct.date")
+    start_year = start_date.map({d: _extract_year(d) for d in start_date.dropna().unique()})
+
+    df = pd.DataFrame({
+        "nctId": nct_id,
+        "briefTitle": brief_title,
+        "startYear": start_year,
+        "country": country,
+    }, columns=["nctId", "briefTitle", "startYear", "country"])
     # ensure startYear is nullable integer dtype
     df["startYear"] = pd.to_numeric(df["startYear"], errors="coerce").astype("Int64")
     return df
\ No newline at end of file
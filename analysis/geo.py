@@ -1,3 +1,4 @@
+import functools
 import pandas as pd
 from typing import Optional
 import pycountry
@@ -16,18 +17,36 @@ _MANUAL_COUNTRY_MAP = {
     "Great Britain": "United Kingdom"
 }
 
+def _build_country_map() -> dict:
+    """Exact-match table of pycountry names and ISO codes, with the manual aliases on top."""
+    mapping = {}
+    for c in pycountry.countries:
+        for attr in ("alpha_2", "alpha_3", "name", "official_name", "common_name"):
+            value = getattr(c, attr, None)
+            if value:
+                mapping.setdefault(value, c.name)
+    mapping.update(_MANUAL_COUNTRY_MAP)
+    return mapping
+
+_COUNTRY_MAP = _build_country_map()
+
+@functools.lru_cache(maxsize=4096)
 def canonicalize_country(name: Optional[str]) -> Optional[str]:
-    if not name:
+    # Missing values arrive as None/NaN from object columns and pd.NA from Arrow-backed ones.
+    if name is None or pd.isna(name) is True or not name:
         return None
     n = str(name).strip()
     if not n:
         return None
-    if n in _MANUAL_COUNTRY_MAP:
-        return _MANUAL_COUNTRY_MAP[n]
+    if n in _COUNTRY_MAP:
+        return _COUNTRY_MAP[n]
     try:
         c = pycountry.countries.lookup(n)
         return c.name
     except Exception:
+        # Fuzzy search is far slower than lookup; skip it for values that can't be a country name.
+        if len(n) < 3 or "," in n or any(ch.isdigit() for ch in n):
+            return n.title()
         try:
             results = pycountry.countries.search_fuzzy(n)
             if results:
@@ -41,10 +60,14 @@ def country_counts(df: pd.DataFrame) -> pd.DataFrame:
         return pd.DataFrame(columns=["country", "count"])
     if "country" not in df.columns:
         return pd.DataFrame(columns=["country", "count"])
-    tmp = df.copy()
-    tmp["country"] = tmp["country"].apply(canonicalize_country)
-    tmp = tmp[tmp["country"].notna()]
-    if tmp.empty:
+    s = df["country"]
+    # Canonicalize each distinct value once, then map back onto the rows.
+    uniq = s.dropna().unique()
+    mapping = {u: canonicalize_country(u) for u in uniq}
+    s = s.map(mapping).dropna()
+    if s.empty:
         return pd.DataFrame(columns=["country", "count"])
-    counts = tmp.groupby("country").size().reset_index(name="count").sort_values("count", ascending=False)
+    # Counting integer category codes is cheaper than hashing every string row.
+    counts = s.astype("category").value_counts().rename_axis("country").reset_index(name="count")
+    counts["country"] = counts["country"].astype(object)
     return counts
\ No newline at end of file
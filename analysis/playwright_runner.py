@@ -1,26 +1,44 @@
+import json
 import os
+import queue
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Tuple, List, Optional
+from typing import Deque, Dict, Tuple, List, Optional
 
-def run_playwright_subprocess(script_path: str, disease: str, max_results: int, output_path: str,
-                              timeout: Optional[int] = None) -> Tuple[int, float, List[str]]:
-    """
-    Run the Playwright scraper script as a subprocess and stream logs.
-    Returns (returncode, elapsed_seconds, logs_lines)
-    """
-    cmd = [sys.executable, script_path, "--disease", disease, "--max_results", str(max_results), "--output", output_path, "--headless"]
-    start = time.perf_counter()
-    logs: List[str] = []
+DEFAULT_LOG_MAX_LINES = 2000
+# Must match playwright_scraper.SERVE_RESULT_PREFIX (the scraper isn't imported here to keep Playwright out of the app process).
+SERVE_RESULT_PREFIX = "SCRAPE_RESULT "
+
+def _log_max_lines() -> Optional[int]:
+    """Max log lines to keep (PLAYWRIGHT_LOG_MAX env var); 0 keeps everything."""
+    try:
+        n = int(os.environ.get("PLAYWRIGHT_LOG_MAX", DEFAULT_LOG_MAX_LINES))
+    except ValueError:
+        n = DEFAULT_LOG_MAX_LINES
+    return n if n > 0 else None
 
+def _scraper_env() -> Dict[str, str]:
     env = os.environ.copy()
     # Streamlit Community Cloud can run the app under a different user than the build.
     # Force Playwright to look in the project-local browsers cache installed by postBuild.
     if sys.platform.startswith("linux"):
         project_root = Path(__file__).resolve().parents[1]
         env.setdefault("PLAYWRIGHT_BROWSERS_PATH", str(project_root / ".playwright-browsers"))
+    return env
+
+def run_playwright_subprocess(script_path: str, disease: str, max_results: int, output_path: str,
+                              timeout: Optional[int] = None) -> Tuple[int, float, List[str]]:
+    """
+    Run the Playwright scraper script as a subprocess and stream logs.
+    Returns (returncode, elapsed_seconds, logs_lines); only the most recent lines are kept.
+    """
+    cmd = [sys.executable, script_path, "--disease", disease, "--max_results", str(max_results), "--output", output_path, "--headless"]
+    start = time.perf_counter()
+    logs: Deque[str] = deque(maxlen=_log_max_lines())
 
     proc = subprocess.Popen(
         cmd,
@@ -28,19 +46,28 @@ def run_playwright_subprocess(script_path: str, disease: str, max_results: int,
         stderr=subprocess.STDOUT,
         text=True,
         bufsize=1,
-        env=env,
+        env=_scraper_env(),
     )
 
+    def _drain(stream) -> None:
+        for line in stream:
+            logs.append(line.rstrip("\n"))
+
     try:
         if proc.stdout is None:
             raise RuntimeError("Playwright process has no stdout")
-        for line in proc.stdout:
-            logs.append(line.rstrip("\n"))
-            if timeout and (time.perf_counter() - start) > timeout:
-                proc.kill()
-                logs.append("Process killed due to timeout.")
-                break
-        proc.wait(timeout=5)
+        # Drain stdout on a helper thread so the deadline below holds even when no newline arrives.
+        reader = threading.Thread(target=_drain, args=(proc.stdout,), daemon=True)
+        reader.start()
+        try:
+            proc.wait(timeout=timeout or None)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait(timeout=5)
+            reader.join(timeout=5)
+            logs.append("Process killed due to timeout.")
+        else:
+            reader.join(timeout=5)
     except Exception as exc:
         try:
             proc.kill()
@@ -48,4 +75,111 @@ def run_playwright_subprocess(script_path: str, disease: str, max_results: int,
             pass
         logs.append(f"Exception while running playwright scraper: {exc}")
     elapsed = time.perf_counter() - start
-    return proc.returncode if proc.returncode is not None else -1, elapsed, logs
+    return proc.returncode if proc.returncode is not None else -1, elapsed, list(logs)
+
+class PlaywrightWorker:
+    """
+    Long-lived `playwright_scraper.py --serve` process that keeps one browser open between scrapes.
+    scrape() has the same return shape as run_playwright_subprocess. Requests are serialized with a lock;
+    the process is (re)started on demand and killed on timeout.
+    """
+
+    def __init__(self, script_path: str, headless: bool = True):
+        self.script_path = script_path
+        self.headless = headless
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _drain(stream, lines: "queue.Queue[Optional[str]]") -> None:
+        for line in stream:
+            lines.put(line.rstrip("\n"))
+        # None marks EOF: the worker process has exited.
+        lines.put(None)
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        cmd = [sys.executable, self.script_path, "--serve", "--headless" if self.headless else "--no-headless"]
+        self._lines = queue.Queue()
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            env=_scraper_env(),
+        )
+        threading.Thread(target=self._drain, args=(proc.stdout, self._lines), daemon=True).start()
+        self._proc = proc
+        return proc
+
+    def scrape(self, disease: str, max_results: int, output_path: str,
+               timeout: Optional[int] = None) -> Tuple[int, float, List[str]]:
+        queued = time.perf_counter()
+        logs: Deque[str] = deque(maxlen=_log_max_lines())
+        returncode = -1
+        with self._lock:
+            # The timeout covers this scrape only, not time spent queued behind another session's.
+            start = time.perf_counter()
+            waited = start - queued
+            if waited >= 0.5:
+                logs.append(f"Waited {waited:.1f}s for the Playwright worker.")
+            try:
+                proc = self._ensure_started()
+                if proc.stdin is None:
+                    raise RuntimeError("Playwright worker has no stdin")
+                command = {"disease": disease, "max_results": int(max_results), "output": str(output_path)}
+                proc.stdin.write(json.dumps(command) + "\n")
+                proc.stdin.flush()
+
+                deadline = start + timeout if timeout else None
+                while True:
+                    remaining = None if deadline is None else deadline - time.perf_counter()
+                    if remaining is not None and remaining <= 0:
+                        self.close(kill=True)
+                        logs.append("Process killed due to timeout.")
+                        break
+                    try:
+                        line = self._lines.get(timeout=remaining)
+                    except queue.Empty:
+                        continue
+                    if line is None:
+                        proc.wait(timeout=5)
+                        returncode = proc.returncode if proc.returncode else -1
+                        logs.append("Playwright worker exited unexpectedly.")
+                        break
+                    if line.startswith(SERVE_RESULT_PREFIX):
+                        reply = json.loads(line[len(SERVE_RESULT_PREFIX):])
+                        if reply.get("ok"):
+                            returncode = 0
+                            logs.append(f"SCRAPED_ITEMS={reply.get('count')}")
+                        else:
+                            returncode = 1
+                            logs.append(f"Scrape failed: {reply.get('error')}")
+                        break
+                    logs.append(line)
+            except Exception as exc:
+                self.close(kill=True)
+                logs.append(f"Exception while running playwright worker: {exc}")
+            elapsed = time.perf_counter() - start
+        return returncode, elapsed, list(logs)
+
+    def close(self, kill: bool = False) -> None:
+        """Stop the worker; by default let it close its browser after stdin EOF."""
+        proc, self._proc = self._proc, None
+        if proc is None or proc.poll() is not None:
+            return
+        try:
+            if kill:
+                proc.kill()
+            elif proc.stdin is not None:
+                proc.stdin.close()
+            proc.wait(timeout=5)
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
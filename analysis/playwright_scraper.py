@@ -3,7 +3,7 @@
 
 Compact Playwright browser scraper used by app.py via analysis/playwright_runner.py.
 
-Writes JSONL with keys expected by app.py:
+Writes Feather (when the output path ends in .feather) or JSONL with keys expected by app.py:
   - nctId
   - briefTitle
   - startYear
@@ -13,18 +13,82 @@ Writes JSONL with keys expected by app.py:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
 import json
+import math
 import re
 import os
+import shutil
 import subprocess
 import sys
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
 
-from playwright.sync_api import sync_playwright
+import pyarrow as pa
+import orjson
+import pyarrow.feather as feather
+from playwright.async_api import async_playwright
 
 
 DEFAULT_TIMEOUT_MS = 30000
+DEFAULT_CONCURRENCY = 6
+SERVE_RESULT_PREFIX = "SCRAPE_RESULT "
+SEARCH_PAGE_CONCURRENCY = 3
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+RECORD_SCHEMA = pa.schema(
+    [
+        ("nctId", pa.string()),
+        ("briefTitle", pa.string()),
+        ("startYear", pa.int32()),
+        ("country", pa.string()),
+    ]
+)
+
+# Set once the headless shell has been found; the browser cache doesn't change within a process.
+_BROWSERS_READY = False
+
+_YEAR_RE = re.compile(r"(\d{4})")
+_YEAR_ANCHORED_RE = re.compile(r"\b(19|20)\d{2}\b")
+_WS_RE = re.compile(r"\s+")
+_ZW_RE = re.compile(r"[\u200B-\u200F]")
+_NCT_RE = re.compile(r"\bNCT\s*(\d{4,})\b", re.IGNORECASE)
+_CT_SUFFIX_RE = re.compile(r"\s+-\s+ClinicalTrials\.gov\s*$", re.IGNORECASE)
+_FULL_TEXT_SUFFIX_RE = re.compile(r"\s+-\s+Full Text View\s*$", re.IGNORECASE)
+
+# Static assets the scraper never reads; aborting them cuts bytes and time-to-DOMContentLoaded.
+_BLOCKED_ASSETS_GLOB = "**/*.{png,jpg,jpeg,gif,svg,woff,woff2,css}"
+
+# Chromium background services that only cost CPU/network when headlessly scraping one site.
+_LEAN_CHROMIUM_ARGS = [
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-features=Translate,BackForwardCache,IsolateOrigins,site-per-process,AutomationControlled",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--mute-audio",
+    "--disable-renderer-backgrounding",
+    "--blink-settings=imagesEnabled=false",
+]
+
+
+def _cache_path(disease: str, max_results: int, suffix: str = ".jsonl") -> Path:
+    key = hashlib.sha1(f"{disease.lower().strip()}|{max_results}".encode("utf-8")).hexdigest()
+    return Path(os.environ.get("SCRAPER_CACHE_DIR", ".scraper-cache")) / f"{key}{suffix}"
+
+
+def _cache_is_fresh(path: Path, ttl_seconds: int = CACHE_TTL_SECONDS) -> bool:
+    try:
+        return path.is_file() and (time.time() - path.stat().st_mtime) < ttl_seconds
+    except OSError:
+        return False
 
 
 def _has_chrome_headless_shell(playwright_cache_dir: Path) -> bool:
@@ -41,6 +105,9 @@ def _has_chrome_headless_shell(playwright_cache_dir: Path) -> bool:
 def _ensure_playwright_browsers_installed(timeout_seconds: int = 600) -> None:
     # Streamlit Community Cloud can sometimes end up with Playwright installed but browsers missing.
     # This makes the scraper resilient even if postBuild didn't persist or got skipped.
+    global _BROWSERS_READY
+    if _BROWSERS_READY:
+        return
     if not sys.platform.startswith("linux"):
         return
 
@@ -50,6 +117,7 @@ def _ensure_playwright_browsers_installed(timeout_seconds: int = 600) -> None:
 
     cache_dir = Path(cache)
     if _has_chrome_headless_shell(cache_dir):
+        _BROWSERS_READY = True
         return
 
     print(f"INFO_PLAYWRIGHT_INSTALL: missing browsers in {cache_dir}; downloading Playwright browsers once")
@@ -86,20 +154,43 @@ def _ensure_playwright_browsers_installed(timeout_seconds: int = 600) -> None:
         print(f"WARN_PLAYWRIGHT_INSTALL_EXCEPTION {type(exc).__name__}: {exc}")
 
     # Re-check after attempting install.
-    if not _has_chrome_headless_shell(cache_dir):
+    if _has_chrome_headless_shell(cache_dir):
+        _BROWSERS_READY = True
+    else:
         print(
             "WARN_PLAYWRIGHT_BROWSERS_STILL_MISSING: headless shell executable not found; "
             "Playwright launch may still fail."
         )
 
 
+def _jsonl_line(rec: Dict[str, Any]) -> str:
+    return orjson.dumps(rec).decode("utf-8") + "\n"
+
+
+def _write_records(records: List[Dict[str, Any]], output_path: Path) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_path.suffix == ".feather":
+        feather.write_feather(pa.Table.from_pylist(records, schema=RECORD_SCHEMA), str(output_path))
+        return
+    with output_path.open("w", encoding="utf-8") as fh:
+        for rec in records:
+            fh.write(_jsonl_line(rec))
+
+
+def _count_records(path: Path) -> int:
+    if path.suffix == ".feather":
+        return feather.read_table(str(path)).num_rows
+    with path.open("r", encoding="utf-8") as fh:
+        return sum(1 for line in fh if line.strip())
+
+
 def _clean_text(val: Optional[str]) -> Optional[str]:
     if val is None:
         return None
     s = str(val)
     s = s.replace("\u00A0", " ").replace("\ufeff", "")
-    s = re.sub(r"[\u200B-\u200F]", "", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _ZW_RE.sub("", s)
+    s = _WS_RE.sub(" ", s).strip()
     return s
 
 
@@ -107,7 +198,7 @@ def _canonical_nct(val: Optional[str]) -> Optional[str]:
     s = _clean_text(val)
     if not s:
         return None
-    m = re.search(r"\bNCT\s*(\d{4,})\b", s, flags=re.IGNORECASE)
+    m = _NCT_RE.search(s)
     return f"NCT{m.group(1)}" if m else s
 
 
@@ -115,16 +206,19 @@ def _extract_year(text: Optional[str]) -> Optional[int]:
     if not text:
         return None
     t = str(text)
-    m = re.search(r"\b(19|20)\d{2}\b", t)
+    # Fast path for values that lead with the year ("2023-05-12", "2023").
+    if len(t) >= 4 and t[:2] in ("19", "20") and t[2:4].isdecimal() and (len(t) == 4 or not (t[4].isalnum() or t[4] == "_")):
+        return int(t[:4])
+    m = _YEAR_ANCHORED_RE.search(t)
     if m:
         return int(m.group(0))
-    m2 = re.search(r"(\d{4})", t)
+    m2 = _YEAR_RE.search(t)
     return int(m2.group(1)) if m2 else None
 
 
-def _pairs_from_search_page(page) -> List[Dict[str, Optional[str]]]:
+async def _pairs_from_search_page(page) -> List[Dict[str, Optional[str]]]:
     try:
-        page.wait_for_selector(".nct-id", timeout=5000)
+        await page.wait_for_selector(".nct-id", timeout=5000)
     except Exception:
         return []
 
@@ -151,7 +245,7 @@ def _pairs_from_search_page(page) -> List[Dict[str, Optional[str]]]:
     )
 
     try:
-        raw = page.eval_on_selector_all(".nct-id", js)
+        raw = await page.eval_on_selector_all(".nct-id", js)
     except Exception:
         raw = []
 
@@ -168,186 +262,389 @@ def _pairs_from_search_page(page) -> List[Dict[str, Optional[str]]]:
     return out
 
 
-def _extract_title_and_start_year(detail_page, timeout_ms: int) -> tuple[Optional[str], Optional[int]]:
+_DETAIL_FIELDS_JS = """() => {
+    const norm = s => (s || '').replace(/\\s+/g, ' ').trim();
+    const text = sel => { const el = document.querySelector(sel); return el ? norm(el.textContent || el.innerText) : null; };
+    const meta = sel => { const el = document.querySelector(sel); return el ? (el.getAttribute('content') || '') : null; };
+    const overview = document.querySelector('div.overview-col-wide span.study-overview-item-text');
+    return {
+        h2: text('h2.brief-title'),
+        ogTitle: meta('meta[property="og:title"]'),
+        twitterTitle: meta('meta[name="twitter:title"]'),
+        docTitle: document.title,
+        mainH1: text('main h1'),
+        h1: text('h1'),
+        overview: overview ? (overview.innerText || '') : null,
+    };
+}"""
+
+
+async def _extract_title_and_start_year(detail_page, timeout_ms: int) -> tuple[Optional[str], Optional[int]]:
     brief_title: Optional[str] = None
     start_year: Optional[int] = None
 
-    def _norm_js(selector: str) -> Optional[str]:
-        try:
-            val = detail_page.eval_on_selector(
-                selector,
-                """el => {
-                    if (!el) return null;
-                    const t = (el.textContent || el.innerText || '');
-                    return t.replace(/\\s+/g, ' ').trim();
-                }""",
-            )
-            return _clean_text(val)
-        except Exception:
-            return None
-
-    def _meta_content(selector: str) -> Optional[str]:
-        try:
-            val = detail_page.eval_on_selector(selector, "el => el ? (el.getAttribute('content') || '') : null")
-            val = _clean_text(val)
-            return val or None
-        except Exception:
-            return None
-
     # Primary selector (works for most studies; also handles nested <mark> tags).
     try:
-        detail_page.wait_for_selector("h2.brief-title", timeout=min(8000, timeout_ms))
+        await detail_page.wait_for_selector("h2.brief-title", timeout=min(8000, timeout_ms))
+    except Exception:
+        pass
+    try:
+        await detail_page.wait_for_selector("div.overview-col-wide span.study-overview-item-text", timeout=timeout_ms)
     except Exception:
         pass
-    brief_title = _norm_js("h2.brief-title")
+
+    # Read every candidate field in a single round-trip; the fallback order is applied below.
+    try:
+        fields = await detail_page.evaluate(_DETAIL_FIELDS_JS) or {}
+    except Exception:
+        fields = {}
+
+    brief_title = _clean_text(fields.get("h2")) or None
 
     # Fallbacks (some pages render the title elsewhere).
     if not brief_title:
-        brief_title = _meta_content('meta[property="og:title"]') or _meta_content('meta[name="twitter:title"]')
+        brief_title = _clean_text(fields.get("ogTitle")) or _clean_text(fields.get("twitterTitle")) or None
 
     if brief_title:
         # og:title / document.title often includes a suffix like " - ClinicalTrials.gov"
-        brief_title = re.sub(r"\s+-\s+ClinicalTrials\.gov\s*$", "", brief_title, flags=re.IGNORECASE).strip()
+        brief_title = _CT_SUFFIX_RE.sub("", brief_title).strip()
 
     if not brief_title:
-        try:
-            page_title = _clean_text(detail_page.title())
-            if page_title:
-                page_title = re.sub(r"\s+-\s+ClinicalTrials\.gov\s*$", "", page_title, flags=re.IGNORECASE).strip()
-                page_title = re.sub(r"\s+-\s+Full Text View\s*$", "", page_title, flags=re.IGNORECASE).strip()
-            brief_title = page_title or None
-        except Exception:
-            brief_title = None
+        page_title = _clean_text(fields.get("docTitle"))
+        if page_title:
+            page_title = _CT_SUFFIX_RE.sub("", page_title).strip()
+            page_title = _FULL_TEXT_SUFFIX_RE.sub("", page_title).strip()
+        brief_title = page_title or None
 
     if not brief_title:
         # As a last resort, grab the first h1 (but avoid the site header itself).
-        t = _norm_js("main h1") or _norm_js("h1")
+        t = _clean_text(fields.get("mainH1")) or _clean_text(fields.get("h1"))
         if t and "clinicaltrials" not in t.lower():
             brief_title = t
 
-    sel = "div.overview-col-wide span.study-overview-item-text"
-    try:
-        detail_page.wait_for_selector(sel, timeout=timeout_ms)
-        el = detail_page.query_selector(sel)
-        if el:
-            start_year = _extract_year(_clean_text(el.inner_text()))
-    except Exception:
-        start_year = None
+    start_year = _extract_year(_clean_text(fields.get("overview")))
 
     return brief_title, start_year
 
 
-def scrape(disease: str, max_results: int, output_path: Path, headless: bool = True, timeout_ms: int = DEFAULT_TIMEOUT_MS) -> int:
-    search_url = f"https://clinicaltrials.gov/search?cond={disease}"
+def _search_url(disease: str, page_no: int) -> str:
+    query = {"cond": disease}
+    if page_no > 1:
+        query["page"] = page_no
+    return f"https://clinicaltrials.gov/search?{urlencode(query)}"
+
+
+def _add_pairs(
+    items: List[Dict[str, Optional[str]]],
+    pairs: List[Dict[str, Optional[str]]],
+    seen: set[str],
+    max_results: int,
+) -> int:
+    """Append unseen items to `pairs` (up to max_results); return how many were added."""
+    added = 0
+    for it in items:
+        if len(pairs) >= max_results:
+            break
+        nct = it.get("nctId")
+        if not nct or nct in seen:
+            continue
+        pairs.append(it)
+        seen.add(nct)
+        added += 1
+    return added
+
+
+async def _fetch_search_page(context, url: str, timeout_ms: int) -> List[Dict[str, Optional[str]]]:
+    page = None
+    try:
+        page = await context.new_page()
+        await page.goto(url, timeout=timeout_ms)
+        return await _pairs_from_search_page(page)
+    except Exception as exc:
+        print(f"WARN_SEARCH_PAGE_FAILED url={url} {type(exc).__name__}: {exc}")
+        return []
+    finally:
+        try:
+            if page:
+                await page.close()
+        except Exception:
+            pass
+
+
+async def _collect_by_clicking_next(
+    page,
+    pairs: List[Dict[str, Optional[str]]],
+    seen: set[str],
+    max_results: int,
+    timeout_ms: int,
+) -> None:
+    while len(pairs) < max_results:
+        next_btn = await page.query_selector('[aria-label="Next page"]')
+        if not next_btn:
+            break
+        try:
+            aria_disabled = await next_btn.get_attribute("aria-disabled")
+            if aria_disabled and aria_disabled.lower() == "true":
+                break
+        except Exception:
+            pass
+        try:
+            await next_btn.click(timeout=timeout_ms)
+        except Exception:
+            break
+        _add_pairs(await _pairs_from_search_page(page), pairs, seen, max_results)
+
+
+async def _abort_route(route) -> None:
+    await route.abort()
+
+
+async def _launch_browser(p, headless: bool):
+    launch_args: List[str] = list(_LEAN_CHROMIUM_ARGS)
+    # Streamlit Community Cloud runs in a restricted Linux container where Chromium sandboxing
+    # and /dev/shm sizing can cause launch crashes.
+    if sys.platform.startswith("linux"):
+        launch_args.extend(["--no-sandbox", "--disable-dev-shm-usage"])
+    return await p.chromium.launch(headless=headless, args=launch_args)
+
+
+async def _scrape_with_browser(
+    browser,
+    disease: str,
+    max_results: int,
+    timeout_ms: int,
+    concurrency: int,
+) -> List[Dict[str, Any]]:
     pairs: List[Dict[str, Optional[str]]] = []
     seen: set[str] = set()
-    records: List[Dict[str, Any]] = []
 
-    # On Streamlit Community Cloud, build/run may happen under different users.
-    # Use a project-local Playwright browser cache so Chromium is found reliably.
-    if sys.platform.startswith("linux"):
-        os.environ.setdefault(
-            "PLAYWRIGHT_BROWSERS_PATH",
-            str((Path(__file__).resolve().parents[1] / ".playwright-browsers")),
-        )
+    # A fresh context per scrape, shared by the search page and every detail tab (cookies, HTTP cache).
+    context = await browser.new_context(java_script_enabled=True, bypass_csp=True)
+    try:
+        await context.route(_BLOCKED_ASSETS_GLOB, _abort_route)
+        page = await context.new_page()
+        await page.goto(_search_url(disease, 1), timeout=timeout_ms)
 
-        # Best-effort: ensure browsers exist before starting Playwright.
-        _ensure_playwright_browsers_installed()
+        first_results = await _pairs_from_search_page(page)
+        _add_pairs(first_results, pairs, seen, max_results)
 
-    with sync_playwright() as p:
-        launch_args: List[str] = []
-        # Streamlit Community Cloud runs in a restricted Linux container where Chromium sandboxing
-        # and /dev/shm sizing can cause launch crashes.
-        if sys.platform.startswith("linux"):
-            launch_args.extend(["--no-sandbox", "--disable-dev-shm-usage"])
-
-        browser = p.chromium.launch(headless=headless, args=launch_args)
-        page = browser.new_page()
-        page.goto(search_url, timeout=timeout_ms)
-
-        while len(pairs) < max_results:
-            for it in _pairs_from_search_page(page):
-                nct = it.get("nctId")
-                if not nct or nct in seen:
-                    continue
-                pairs.append(it)
-                seen.add(nct)
-                if len(pairs) >= max_results:
-                    break
+        # The first page tells us the page size; fetch the remaining result pages by URL in parallel.
+        per_page = len(first_results)
+        if per_page and len(pairs) < max_results:
+            pages_needed = math.ceil(max_results / per_page)
+            search_sem = asyncio.Semaphore(SEARCH_PAGE_CONCURRENCY)
 
-            if len(pairs) >= max_results:
-                break
+            async def fetch_search_page(page_no: int) -> List[Dict[str, Optional[str]]]:
+                async with search_sem:
+                    return await _fetch_search_page(context, _search_url(disease, page_no), timeout_ms)
 
-            next_btn = page.query_selector('[aria-label="Next page"]')
-            if not next_btn:
-                break
-            try:
-                aria_disabled = next_btn.get_attribute("aria-disabled")
-                if aria_disabled and aria_disabled.lower() == "true":
-                    break
-            except Exception:
-                pass
-            try:
-                next_btn.click(timeout=timeout_ms)
-            except Exception:
-                break
+            later_results = await asyncio.gather(*(fetch_search_page(n) for n in range(2, pages_needed + 1)))
+            added = 0
+            for results in later_results:
+                added += _add_pairs(results, pairs, seen, max_results)
+
+            # If the site ignored the page parameter nothing new arrived; page through the UI instead.
+            if later_results and not added:
+                await _collect_by_clicking_next(page, pairs, seen, max_results, timeout_ms)
+
+        await page.close()
+        sem = asyncio.Semaphore(max(1, concurrency))
 
-        for it in pairs[:max_results]:
+        async def fetch_detail(it: Dict[str, Optional[str]]) -> Optional[Dict[str, Any]]:
             nct_id = it.get("nctId")
             url = it.get("url")
             if not nct_id or not url:
-                continue
+                return None
 
             detail = None
             brief_title = None
             start_year = None
-            try:
-                detail = browser.new_page()
-                detail.goto(url, timeout=timeout_ms, wait_until="domcontentloaded")
-                brief_title, start_year = _extract_title_and_start_year(detail, timeout_ms)
-            finally:
+            async with sem:
                 try:
-                    if detail:
-                        detail.close()
-                except Exception:
-                    pass
+                    detail = await context.new_page()
+                    await detail.goto(url, timeout=timeout_ms, wait_until="domcontentloaded")
+                    brief_title, start_year = await _extract_title_and_start_year(detail, timeout_ms)
+                finally:
+                    try:
+                        if detail:
+                            await detail.close()
+                    except Exception:
+                        pass
 
             if brief_title and "unknown status" in brief_title.lower():
-                continue
+                return None
 
             final_title = brief_title or it.get("briefTitle")
             if not final_title:
                 print(f"WARN_TITLE_NONE nctId={nct_id} url={url}")
 
-            records.append(
-                {
-                    "nctId": nct_id,
-                    "briefTitle": final_title,
-                    "startYear": start_year,
-                    "country": it.get("country"),
-                }
-            )
+            return {
+                "nctId": nct_id,
+                "briefTitle": final_title,
+                "startYear": start_year,
+                "country": it.get("country"),
+            }
 
-        browser.close()
+        # gather() keeps results in search order regardless of which tab finishes first.
+        results = await asyncio.gather(*(fetch_detail(it) for it in pairs[:max_results]))
+    finally:
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    return [rec for rec in results if rec is not None]
+
+
+async def _scrape_async(
+    disease: str,
+    max_results: int,
+    headless: bool,
+    timeout_ms: int,
+    concurrency: int,
+) -> List[Dict[str, Any]]:
+    async with async_playwright() as p:
+        browser = await _launch_browser(p, headless)
+        try:
+            return await _scrape_with_browser(browser, disease, max_results, timeout_ms, concurrency)
+        finally:
+            await browser.close()
+
+
+def _prepare_browsers() -> None:
+    # On Streamlit Community Cloud, build/run may happen under different users.
+    # Use a project-local Playwright browser cache so Chromium is found reliably.
+    if sys.platform.startswith("linux"):
+        os.environ.setdefault(
+            "PLAYWRIGHT_BROWSERS_PATH",
+            str((Path(__file__).resolve().parents[1] / ".playwright-browsers")),
+        )
+
+        # Best-effort: ensure browsers exist before starting Playwright.
+        _ensure_playwright_browsers_installed()
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as fh:
-        for rec in records[:max_results]:
-            fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
 
-    return len(records[:max_results])
+def _load_from_cache(cache_path: Path, output_path: Path) -> Optional[int]:
+    """Copy a fresh cached result to output_path and return its record count (None on a miss)."""
+    if not _cache_is_fresh(cache_path):
+        return None
+    try:
+        # Validate the cached file before copying it; a truncated or corrupt entry is just a miss.
+        n = _count_records(cache_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cache_path, output_path)
+    except Exception as exc:
+        print(f"WARN_SCRAPER_CACHE_READ_FAILED {type(exc).__name__}: {exc}")
+        return None
+    print(f"INFO_SCRAPER_CACHE_HIT path={cache_path}")
+    return n
+
+
+def _save_results(records: List[Dict[str, Any]], output_path: Path, cache_path: Path) -> int:
+    _write_records(records, output_path)
+
+    # An empty result usually means the search page didn't load; don't pin that for the whole TTL.
+    if not records:
+        return 0
+
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Copy then rename, so readers never see a partially written cache file.
+        shutil.copyfile(output_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        print(f"WARN_SCRAPER_CACHE_WRITE_FAILED {type(exc).__name__}: {exc}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+    return len(records)
+
+
+def scrape(
+    disease: str,
+    max_results: int,
+    output_path: Path,
+    headless: bool = True,
+    timeout_ms: int = DEFAULT_TIMEOUT_MS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
+    # Repeat queries within the TTL are served from disk without launching a browser.
+    cache_path = _cache_path(disease, max_results, output_path.suffix or ".jsonl")
+    n = _load_from_cache(cache_path, output_path)
+    if n is not None:
+        return n
+
+    _prepare_browsers()
+    records = asyncio.run(_scrape_async(disease, max_results, headless, timeout_ms, concurrency))
+    return _save_results(records[:max_results], output_path, cache_path)
+
+
+async def _serve(headless: bool, timeout_ms: int, concurrency: int) -> None:
+    """Answer newline-delimited JSON scrape commands on stdin, reusing one browser until stdin closes.
+
+    Each command is {"disease": ..., "max_results": ..., "output": ...}; each reply is one
+    SERVE_RESULT_PREFIX line with {"ok": true, "count": n} or {"ok": false, "error": ...}.
+    """
+    loop = asyncio.get_running_loop()
+    async with async_playwright() as p:
+        browser = None
+        try:
+            while True:
+                line = await loop.run_in_executor(None, sys.stdin.readline)
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                try:
+                    cmd = json.loads(line)
+                    disease = str(cmd["disease"])
+                    max_results = int(cmd["max_results"])
+                    output_path = Path(cmd["output"])
+                    cache_path = _cache_path(disease, max_results, output_path.suffix or ".jsonl")
+                    n = _load_from_cache(cache_path, output_path)
+                    if n is None:
+                        if browser is None or not browser.is_connected():
+                            browser = await _launch_browser(p, headless)
+                        records = await _scrape_with_browser(browser, disease, max_results, timeout_ms, concurrency)
+                        n = _save_results(records[:max_results], output_path, cache_path)
+                    reply: Dict[str, Any] = {"ok": True, "count": n}
+                except Exception as exc:
+                    print(f"FATAL: {type(exc).__name__}: {exc}")
+                    reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+                print(SERVE_RESULT_PREFIX + json.dumps(reply))
+        finally:
+            if browser is not None:
+                try:
+                    await browser.close()
+                except Exception:
+                    pass
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--disease", required=True)
+    parser.add_argument("--disease")
     parser.add_argument("--max_results", type=int, default=25)
-    parser.add_argument("--output", required=True)
+    parser.add_argument("--output")
     parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT_MS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
     parser.add_argument("--headless", action="store_true", default=True)
     parser.add_argument("--no-headless", dest="headless", action="store_false")
+    parser.add_argument("--serve", action="store_true", help="Keep a browser open and read JSON commands from stdin.")
     args = parser.parse_args()
 
+    if args.serve:
+        # Replies must reach the parent as soon as they're printed.
+        sys.stdout.reconfigure(line_buffering=True)
+        _prepare_browsers()
+        asyncio.run(_serve(headless=bool(args.headless), timeout_ms=int(args.timeout), concurrency=int(args.concurrency)))
+        return
+    if not args.disease or not args.output:
+        parser.error("--disease and --output are required unless --serve is given")
+
     try:
         n = scrape(
             disease=args.disease,
@@ -355,6 +652,7 @@ def main() -> None:
             output_path=Path(args.output),
             headless=bool(args.headless),
             timeout_ms=int(args.timeout),
+            concurrency=int(args.concurrency),
         )
         print(f"SCRAPED_ITEMS={n}")
     except Exception as exc:
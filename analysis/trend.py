@@ -8,9 +8,8 @@ def compute_trend(df: pd.DataFrame) -> pd.DataFrame:
         return pd.DataFrame(columns=["start_year", "count"])
     if "startYear" not in df.columns:
         return pd.DataFrame(columns=["start_year", "count"])
-    tmp = df.dropna(subset=["startYear"]).copy()
-    if tmp.empty:
+    s = df["startYear"].dropna().astype("int32")
+    if s.empty:
         return pd.DataFrame(columns=["start_year", "count"])
-    grouped = tmp.groupby("startYear").size().reset_index(name="count").sort_values("startYear")
-    grouped = grouped.rename(columns={"startYear": "start_year"})
+    grouped = s.value_counts().sort_index().rename_axis("start_year").reset_index(name="count")
     return grouped
\ No newline at end of file
@@ -1,22 +1,24 @@
+import io
 import streamlit as st
 import pandas as pd
 import time
 from pathlib import Path
 import plotly.express as px
-import matplotlib.pyplot as plt
-import seaborn as sns
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import orjson
 
 from analysis.api_client import get_clinical_trials
 from analysis.trend import compute_trend
 from analysis.geo import country_counts, canonicalize_country
-from analysis.playwright_runner import run_playwright_subprocess
+from analysis.playwright_runner import PlaywrightWorker
 
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 
-st.set_page_config(page_title="Clinical Trials Analytics", layout="wide")
-st.markdown(
-        """
+# Static page styling: hero banner plus responsive tweaks (reduce horizontal scrolling in tables).
+_STATIC_CSS = """
 <style>
 .hero {
     padding: 1.1rem 1.2rem;
@@ -41,23 +43,6 @@ st.markdown(
     font-size: 0.95rem;
     opacity: 0.85;
 }
-</style>
-
-<div class="hero">
-    <div class="hero-title">🧬 Clinical Trials Analytics Dashboard</div>
-    <div class="hero-sub">Portfolio project for Balazs Csigi</div>
-    <div class="hero-meta">API vs Browser Scraper (ClinicalTrials.gov)</div>
-</div>
-""",
-        unsafe_allow_html=True,
-)
-
-st.write("")
-
-# Responsive tweaks (reduce horizontal scrolling in tables).
-st.markdown(
-        """
-<style>
 div[data-testid="stDataFrame"] div[role="gridcell"],
 div[data-testid="stDataFrame"] div[role="columnheader"] {
     white-space: normal !important;
@@ -69,9 +54,20 @@ div[data-testid="stDataFrame"] div[role="gridcell"] > div {
     div[data-testid="stDataFrame"] { font-size: 12px; }
 }
 </style>
-        """,
-        unsafe_allow_html=True,
-)
+"""
+
+_HERO_HTML = """
+<div class="hero">
+    <div class="hero-title">🧬 Clinical Trials Analytics Dashboard</div>
+    <div class="hero-sub">Portfolio project for Balazs Csigi</div>
+    <div class="hero-meta">API vs Browser Scraper (ClinicalTrials.gov)</div>
+</div>
+"""
+
+st.set_page_config(page_title="Clinical Trials Analytics", layout="wide")
+st.markdown(_STATIC_CSS + _HERO_HTML, unsafe_allow_html=True)
+
+st.write("")
 
 # ---------------- Sidebar ----------------
 st.sidebar.header("Configuration")
@@ -87,13 +83,63 @@ run_browser_btn = st.sidebar.button("Run Browser Scraper (Playwright)")
 show_playwright_logs = st.sidebar.checkbox("Show Playwright debug logs", value=False)
 # uploaded_file = st.sidebar.file_uploader("Or upload pre-scraped JSONL/CSV", type=["csv", "jsonl", "json"])
 
-# cached API fetch
-@st.cache_data(ttl=300)
+def _frame_key(df: pd.DataFrame) -> bytes:
+    # st.cache_data is shared across sessions and id() values get reused, so key on content.
+    return pd.util.hash_pandas_object(df, index=True).values.tobytes() + str(tuple(df.columns)).encode()
+
+_DF_HASH_FUNCS = {pd.DataFrame: _frame_key}
+
+# cached API fetch (the spinner around the call already reports progress)
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
 def fetch_api_cached(disease: str, max_results_api: int):
     t0 = time.perf_counter()
     df = get_clinical_trials(disease, page_size=max_results_api)
     return df, time.perf_counter() - t0
 
+@st.cache_data(show_spinner=False)
+def _canon_map(values: tuple) -> dict:
+    """Canonical country name for each distinct raw value (so .map replaces a per-row .apply)."""
+    return {v: canonicalize_country(v) for v in values}
+
+def read_scraper_output(path: Path) -> pd.DataFrame:
+    """Load the scraper's output file; Feather keeps the column types, legacy JSONL is still accepted."""
+    if path.suffix == ".feather":
+        return pd.read_feather(path)
+    data = path.read_bytes()
+    lines = [line for line in data.splitlines() if line.strip()]
+    if not lines:
+        return pd.DataFrame(columns=["nctId", "briefTitle", "startYear", "country"])
+    return pd.DataFrame.from_records([orjson.loads(line) for line in lines])
+
+@st.cache_resource
+def _playwright_worker() -> PlaywrightWorker:
+    # One scraper process (and browser) for the whole app, reused across runs and sessions.
+    return PlaywrightWorker(script_path="analysis/playwright_scraper.py")
+
+# Normalize helper
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def normalize_df_for_app(df: pd.DataFrame) -> pd.DataFrame:
+    if df is None:
+        return pd.DataFrame(columns=["nctId", "briefTitle", "startYear", "country"])
+    # No up-front copy: rename/assign return new frames, so the session_state frame is never mutated.
+    df2 = df
+    renames = {}
+    if "start_year" in df2.columns and "startYear" not in df2.columns:
+        renames["start_year"] = "startYear"
+    if "nct_id" in df2.columns and "nctId" not in df2.columns:
+        renames["nct_id"] = "nctId"
+    if renames:
+        df2 = df2.rename(columns=renames)
+    updates = {}
+    if "country" in df2.columns:
+        # Few distinct countries over many rows: keep them as category codes (dictionary-encoded in Arrow).
+        updates["country"] = pd.Categorical(df2["country"].map(_canon_map(tuple(df2["country"].dropna().unique()))))
+    if "startYear" in df2.columns:
+        updates["startYear"] = pd.to_numeric(df2["startYear"], errors="coerce").astype("Int64")
+    if updates:
+        df2 = df2.assign(**updates)
+    return df2
+
 # session containers
 if "df_api" not in st.session_state:
     st.session_state["df_api"] = None
@@ -110,20 +156,18 @@ if fetch_api_btn:
         if df_api is None:
             st.error("API returned no data.")
         else:
-            if "country" in df_api.columns:
-                df_api["country"] = df_api["country"].apply(lambda v: canonicalize_country(v))
-            st.session_state["df_api"] = df_api
+            # Normalized once here; reruns read the stored frame without re-hashing the raw one.
+            st.session_state["df_api"] = normalize_df_for_app(df_api)
             st.session_state["api_time"] = api_time
             st.success(f"API: loaded {len(df_api)} trials (t={api_time:.2f}s)")
 
 # Run Browser Scraper (Playwright)
 if run_browser_btn:
     timestamp = int(time.time())
-    out_path = DATA_DIR / f"playwright_{disease.replace(' ', '_')}_{timestamp}.jsonl"
+    out_path = DATA_DIR / f"playwright_{disease.replace(' ', '_')}_{timestamp}.feather"
     st.info(f"Running Playwright scraper for '{disease}' (max {max_results_browser}). This runs a subprocess and may take a while. Scraping ClinicalTrials.gov is just for demonstration purposes. The API method is orders of magnitude faster for querying this website in a production environment. Records with 'unknown status' are excluded. See the README for more information.")
     with st.spinner("Running Playwright (separate process)..."):
-        returncode, elapsed, logs = run_playwright_subprocess(
-            script_path="analysis/playwright_scraper.py",
+        returncode, elapsed, logs = _playwright_worker().scrape(
             disease=disease,
             max_results=int(max_results_browser),
             output_path=str(out_path),
@@ -135,12 +179,8 @@ if run_browser_btn:
             st.text_area("", value="\n".join(logs), height=300)
     if returncode == 0 and out_path.exists():
         try:
-            df_scraped = pd.read_json(out_path, lines=True)
-            if "startYear" in df_scraped.columns:
-                df_scraped["startYear"] = pd.to_numeric(df_scraped["startYear"], errors="coerce").astype("Int64")
-            if "country" in df_scraped.columns:
-                df_scraped["country"] = df_scraped["country"].apply(lambda v: canonicalize_country(v))
-            st.session_state["df_scraped"] = df_scraped
+            df_scraped = read_scraper_output(out_path)
+            st.session_state["df_scraped"] = normalize_df_for_app(df_scraped)
             st.success(f"Playwright: loaded {len(df_scraped)} records (saved to {out_path}) in {elapsed:.1f}s")
         except Exception as e:
             st.error(f"Could not read Playwright output: {e}")
@@ -155,31 +195,31 @@ if show_playwright_logs and st.session_state.get("playwright_logs"):
 # show status
 df_api = st.session_state.get("df_api")
 df_scraped = st.session_state.get("df_scraped")
+if df_api is None:
+    df_api = normalize_df_for_app(None)
+if df_scraped is None:
+    df_scraped = normalize_df_for_app(None)
 
 PRIMARY_COLS = ["nctId", "briefTitle", "startYear", "country"]
 
-# Normalize helper
-def normalize_df_for_app(df: pd.DataFrame) -> pd.DataFrame:
-    if df is None:
-        return pd.DataFrame(columns=["nctId", "briefTitle", "startYear", "country"])
-    df2 = df.copy()
-    if "start_year" in df2.columns and "startYear" not in df2.columns:
-        df2 = df2.rename(columns={"start_year": "startYear"})
-    if "nct_id" in df2.columns and "nctId" not in df2.columns:
-        df2 = df2.rename(columns={"nct_id": "nctId"})
-    if "country" in df2.columns:
-        df2["country"] = df2["country"].apply(lambda v: canonicalize_country(v))
-    if "startYear" in df2.columns:
-        df2["startYear"] = pd.to_numeric(df2["startYear"], errors="coerce").astype("Int64")
-    return df2
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def compute_trend_cached(df: pd.DataFrame) -> pd.DataFrame:
+    return compute_trend(df)
 
-df_api = normalize_df_for_app(df_api)
-df_scraped = normalize_df_for_app(df_scraped)
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def country_counts_cached(df: pd.DataFrame) -> pd.DataFrame:
+    return country_counts(df)
 
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
 def view_for_table(df: pd.DataFrame) -> pd.DataFrame:
-    if df is None or df.empty:
-        return df
-    return df
+    # Only the primary columns, Arrow-backed, so st.dataframe's Arrow conversion is near zero-copy.
+    return df.loc[:, [c for c in PRIMARY_COLS if c in df.columns]].convert_dtypes(dtype_backend="pyarrow")
 
 st.markdown("## Data status")
 # Comparison UI
@@ -221,30 +261,34 @@ with st.expander("📄 Records from scraped data", expanded=True):
 dl1, dl2 = st.columns(2)
 with dl1:
     if df_api is not None and not df_api.empty:
-        st.download_button("⬇️ Download API CSV", df_api.to_csv(index=False), file_name=f"{disease.replace(' ','_')}_api.csv")
+        st.download_button("⬇️ Download API CSV", _csv_bytes(df_api), file_name=f"{disease.replace(' ','_')}_api.csv")
 with dl2:
     if df_scraped is not None and not df_scraped.empty:
-        st.download_button("⬇️ Download Scraped CSV", df_scraped.to_csv(index=False), file_name=f"{disease.replace(' ','_')}_playwright.csv")
+        st.download_button("⬇️ Download Scraped CSV", _csv_bytes(df_scraped), file_name=f"{disease.replace(' ','_')}_playwright.csv")
 
 # Trend comparison
 st.subheader("📈 Trend comparison")
-trend_api = compute_trend(df_api) if df_api is not None else None
-trend_scr = compute_trend(df_scraped) if df_scraped is not None else None
-
-fig = px.line(title=f"{disease} — API vs Browser Scraper: Trials per Year")
-if trend_api is not None and not trend_api.empty:
-    fig.add_scatter(x=trend_api["start_year"], y=trend_api["count"], mode="lines+markers", name="API")
-if trend_scr is not None and not trend_scr.empty:
-    fig.add_scatter(x=trend_scr["start_year"], y=trend_scr["count"], mode="lines+markers", name="Browser Scraper")
-if fig.data:
+trend_api = compute_trend_cached(df_api) if (df_api is not None and not df_api.empty) else None
+trend_scr = compute_trend_cached(df_scraped) if (df_scraped is not None and not df_scraped.empty) else None
+
+has_api_trend = trend_api is not None and not trend_api.empty
+has_scr_trend = trend_scr is not None and not trend_scr.empty
+if has_api_trend or has_scr_trend:
+    fig = px.line(title=f"{disease} — API vs Browser Scraper: Trials per Year")
+    if has_api_trend:
+        fig.add_scatter(x=trend_api["start_year"], y=trend_api["count"], mode="lines+markers", name="API")
+    if has_scr_trend:
+        fig.add_scatter(x=trend_scr["start_year"], y=trend_scr["count"], mode="lines+markers", name="Browser Scraper")
     st.plotly_chart(fig, use_container_width=True)
 else:
     st.info("Not enough year data available for trend comparison.")
 
 # Country comparison
 st.subheader("🗺️ Country comparison (top 15)")
-geo_api = country_counts(df_api) if df_api is not None else None
-geo_scr = country_counts(df_scraped) if df_scraped is not None else None
+geo_api = country_counts_cached(df_api) if (df_api is not None and not df_api.empty) else None
+geo_scr = country_counts_cached(df_scraped) if (df_scraped is not None and not df_scraped.empty) else None
+top15_api = geo_api.head(15) if geo_api is not None else None
+top15_scr = geo_scr.head(15) if geo_scr is not None else None
 
 map_projection = st.selectbox(
     "Map projection",
@@ -253,7 +297,9 @@ map_projection = st.selectbox(
     help="Orthographic looks like a globe; natural earth is a good default.",
 )
 
-def make_country_choropleth(geo_df: pd.DataFrame, title: str):
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def make_country_choropleth(geo_df: pd.DataFrame, title: str, map_projection: str) -> dict:
+    # Cached as a plain figure dict; callers rebuild it with go.Figure().
     fig = px.choropleth(
         geo_df,
         locations="country",
@@ -288,36 +334,48 @@ def make_country_choropleth(geo_df: pd.DataFrame, title: str):
         margin=dict(l=0, r=0, t=40, b=0),
         coloraxis_colorbar=dict(title="Trials"),
     )
-    return fig
-
-g1, g2 = st.columns(2)
-with g1:
-    st.markdown("**API — Top countries**")
-    if geo_api is None or geo_api.empty:
-        st.write("No country data")
-    else:
-        st.dataframe(geo_api.head(15), use_container_width=True, hide_index=True)
-        fig_map_api = make_country_choropleth(geo_api, title="API: Trials by Country")
-        st.plotly_chart(fig_map_api, use_container_width=True)
-with g2:
-    st.markdown("**Browser Scraper — Top countries**")
-    if geo_scr is None or geo_scr.empty:
-        st.write("No country data")
-    else:
-        st.dataframe(geo_scr.head(15), use_container_width=True, hide_index=True)
-        fig_map_scr = make_country_choropleth(geo_scr, title="Browser Scraper: Trials by Country")
-        st.plotly_chart(fig_map_scr, use_container_width=True)
+    return fig.to_dict()
+
+def _stateful_tabs(labels: list, key: str):
+    # With on_change="rerun" each tab reports .open, so hidden tab bodies can be skipped.
+    try:
+        return st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:  # older Streamlit: no tab state, every tab body renders
+        return st.tabs(labels)
+
+tab_api, tab_scr = _stateful_tabs(["Official API", "Browser Scraper"], key="country_tabs")
+with tab_api:
+    if getattr(tab_api, "open", None) is not False:
+        st.markdown("**API — Top countries**")
+        if geo_api is None or geo_api.empty:
+            st.write("No country data")
+        else:
+            st.dataframe(top15_api, use_container_width=True, hide_index=True)
+            fig_map_api = go.Figure(make_country_choropleth(geo_api, "API: Trials by Country", map_projection))
+            st.plotly_chart(fig_map_api, use_container_width=True)
+with tab_scr:
+    if getattr(tab_scr, "open", None) is not False:
+        st.markdown("**Browser Scraper — Top countries**")
+        if geo_scr is None or geo_scr.empty:
+            st.write("No country data")
+        else:
+            st.dataframe(top15_scr, use_container_width=True, hide_index=True)
+            fig_map_scr = go.Figure(make_country_choropleth(geo_scr, "Browser Scraper: Trials by Country", map_projection))
+            st.plotly_chart(fig_map_scr, use_container_width=True)
 
 # Heatmap
 st.subheader("🔥 Heatmap of top countries (API priority)")
-preferred_geo = geo_api if (geo_api is not None and not geo_api.empty) else geo_scr
-if preferred_geo is None or preferred_geo.empty:
+top_geo = top15_api if (top15_api is not None and not top15_api.empty) else top15_scr
+if top_geo is None or top_geo.empty:
     st.info("No country data to show heatmap.")
 else:
-    top_geo = preferred_geo.head(15)
-    fig_hm, ax = plt.subplots(figsize=(8, max(2, len(top_geo)*0.35)))
-    sns.heatmap(top_geo.set_index("country").T, annot=True, fmt="d", cmap="Reds", cbar=True, ax=ax)
-    ax.set_ylabel("")
-    st.pyplot(fig_hm)
+    fig_hm = px.imshow(
+        top_geo.set_index("country")["count"].to_frame().T,
+        text_auto="d",
+        color_continuous_scale="Reds",
+        aspect="auto",
+    )
+    fig_hm.update_layout(yaxis_title=None, xaxis_title=None)
+    st.plotly_chart(fig_hm, use_container_width=True)
 
 